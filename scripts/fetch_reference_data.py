@@ -8,11 +8,12 @@ Author: GreenGrocer Project
 Date: 2025
 """
 
-import requests
-import json
+import asyncio
+import aiohttp
+import orjson
 import random
-import time
 import os
+import numpy as np
 
 # Configuration Constants
 # Get the directory where this script is located
@@ -27,14 +28,58 @@ CATEGORIES_TO_FETCH = [
     "snacks", "beverages", "dairies", "cereals", "meats", "cheeses", "breads"
 ]
 
+# Maximum number of category requests in flight at the same time
+MAX_CONCURRENT_REQUESTS = 4
 
-def fetch_products_from_api():
+# NumPy random generator used for vectorized price generation
+rng = np.random.default_rng()
+
+
+async def fetch_category(session, semaphore, category):
+    """
+    Fetch a single product category from the OpenFoodFacts API.
+    
+    The semaphore caps how many requests are in flight at once so we stay
+    polite to the API while still overlapping network round-trips.
+    
+    Args:
+        session (aiohttp.ClientSession): Shared HTTP session
+        semaphore (asyncio.Semaphore): Limits concurrent requests
+        category (str): OpenFoodFacts category slug
+    
+    Returns:
+        list: Raw product items returned by the API (empty on failure)
+    """
+    # Construct API URL for specific category
+    url = f"https://world.openfoodfacts.org/category/{category}.json"
+    params = {
+        "page_size": 20,  # Get top 20 items per category
+        "fields": "code,product_name,categories_tags,brands"
+    }
+    
+    async with semaphore:
+        print(f"   Fetching category: {category}...")
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    return data.get('products', [])
+                
+                print(f"   ❌ Failed to fetch {category}: Status {response.status}")
+        except Exception as e:
+            print(f"   ⚠️ Error fetching {category}: {e}")
+    
+    return []
+
+
+async def fetch_products_from_api():
     """
     Fetch real product data from OpenFoodFacts API.
     
-    This function iterates through predefined grocery categories and retrieves
-    product information including names, brands, and categories. It generates
-    synthetic pricing and perishability data since the API doesn't provide this.
+    This function requests all predefined grocery categories concurrently and
+    retrieves product information including names, brands, and categories. It
+    generates synthetic pricing and perishability data since the API doesn't
+    provide this.
     
     Returns:
         list: A list of dictionaries, each containing product information:
@@ -52,55 +97,48 @@ def fetch_products_from_api():
     # Set user agent to identify our application
     headers = {"User-Agent": "GreenGrocerProject/1.0 (educational purpose)"}
     
-    for category in CATEGORIES_TO_FETCH:
-        print(f"   Fetching category: {category}...")
-        
-        # Construct API URL for specific category
-        url = f"https://world.openfoodfacts.org/category/{category}.json"
-        params = {
-            "page_size": 20,  # Get top 20 items per category
-            "fields": "code,product_name,categories_tags,brands"
-        }
-        
-        try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get('products', [])
-                
-                for item in items:
-                    # Skip products without a name
-                    if 'product_name' not in item or not item['product_name']:
-                        continue
-                    
-                    # Generate realistic pricing (API doesn't provide prices)
-                    # Random price between $2.00 and $15.00
-                    sell_price = round(random.uniform(2.00, 15.00), 2)
-                    
-                    # Cost price is 40-70% of selling price (realistic markup)
-                    cost_price = round(sell_price * random.uniform(0.4, 0.7), 2)
-                    
-                    # Determine if product is perishable based on category
-                    is_perishable = category in ["dairies", "meats", "cheeses", "breads"]
-
-                    products_master.append({
-                        "product_id": item.get('code', f"GEN-{random.randint(10000, 99999)}"),
-                        "product_name": item['product_name'],
-                        "brand": item.get('brands', 'Unknown'),
-                        "category": category,
-                        "price_sell": sell_price,
-                        "price_cost": cost_price,
-                        "is_perishable": is_perishable
-                    })
-            else:
-                print(f"   ❌ Failed to fetch {category}: Status {response.status_code}")
-            
-            # Be polite to the API - add delay between requests
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"   ⚠️ Error fetching {category}: {e}")
+    # Be polite to the API - cap the number of simultaneous requests
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    # One timeout for every request made through the session
+    timeout = aiohttp.ClientTimeout(total=10)
+    
+    async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+        tasks = [fetch_category(session, semaphore, category) for category in CATEGORIES_TO_FETCH]
+        results = await asyncio.gather(*tasks)
+    
+    # gather() preserves task order, so results line up with CATEGORIES_TO_FETCH
+    # Keep only products with a name
+    named_items = [
+        (category, item)
+        for category, items in zip(CATEGORIES_TO_FETCH, results)
+        for item in items
+        if item.get('product_name')
+    ]
+    
+    # Generate realistic pricing for all products in one pass (API doesn't provide prices)
+    # Random price between $2.00 and $15.00
+    sell_prices = np.round(rng.uniform(2.00, 15.00, size=len(named_items)), 2)
+    
+    # Cost price is 40-70% of selling price (realistic markup)
+    cost_prices = np.round(sell_prices * rng.uniform(0.4, 0.7, size=len(named_items)), 2)
+    
+    for (category, item), sell_price, cost_price in zip(named_items, sell_prices.tolist(), cost_prices.tolist()):
+        # Determine if product is perishable based on category
+        is_perishable = category in ["dairies", "meats", "cheeses", "breads"]
+
+        # Only generate a fallback ID when the API item has no code
+        product_id = item['code'] if 'code' in item else f"GEN-{random.randint(10000, 99999)}"
+
+        products_master.append({
+            "product_id": product_id,
+            "product_name": item['product_name'],
+            "brand": item.get('brands', 'Unknown'),
+            "category": category,
+            "price_sell": sell_price,
+            "price_cost": cost_price,
+            "is_perishable": is_perishable
+        })
 
     print(f"✅ Fetched {len(products_master)} real products.")
     return products_master
@@ -176,7 +214,7 @@ def main():
     print(f"📁 Using directory: {abs_output_dir}")
     
     # Step 1: Fetch real products from API
-    products = fetch_products_from_api()
+    products = asyncio.run(fetch_products_from_api())
     
     # Step 2: Generate synthetic store data
     stores = generate_stores()
@@ -190,13 +228,14 @@ def main():
     abs_stores_path = os.path.abspath(stores_path)
     
     # Write products to JSON file
-    with open(products_path, "w", encoding='utf-8') as f:
-        json.dump(products, f, indent=2, ensure_ascii=False)
+    # orjson serializes straight to UTF-8 bytes (non-ASCII kept as-is)
+    with open(products_path, "wb") as f:
+        f.write(orjson.dumps(products, option=orjson.OPT_INDENT_2))
     print(f"✅ Products saved to: {abs_products_path}")
     
     # Write stores to JSON file
-    with open(stores_path, "w", encoding='utf-8') as f:
-        json.dump(stores, f, indent=2, ensure_ascii=False)
+    with open(stores_path, "wb") as f:
+        f.write(orjson.dumps(stores, option=orjson.OPT_INDENT_2))
     print(f"✅ Stores saved to: {abs_stores_path}")
     
     print(f"\n🎉 Reference data generation complete!")
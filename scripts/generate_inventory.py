@@ -16,11 +16,12 @@ Author: GreenGrocer Project
 Date: 2025
 """
 
-import json
-import csv
+import orjson
 import random
 import os
-from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from datetime import datetime
 
 # --- CONFIGURATION ---
 # Establish directory structure using script location
@@ -40,6 +41,10 @@ END_DATE = datetime(2025, 12, 31)
 # Twice-weekly delivery is realistic for grocery retail
 DELIVERY_DAYS = [0, 3]
 
+# NumPy random generator used for vectorized sampling (product selection,
+# quantities, delivery IDs)
+rng = np.random.default_rng()
+
 
 def load_reference_data():
     """
@@ -52,20 +57,20 @@ def load_reference_data():
     
     Raises:
         FileNotFoundError: If reference data files are missing
-        json.JSONDecodeError: If JSON files are malformed
+        orjson.JSONDecodeError: If JSON files are malformed
     """
     p_path = os.path.join(REFERENCE_DIR, "products_master.json")
     s_path = os.path.join(REFERENCE_DIR, "stores_master.json")
     
-    with open(p_path, 'r', encoding='utf-8') as f:
-        products = json.load(f)
-    with open(s_path, 'r', encoding='utf-8') as f:
-        stores = json.load(f)
+    with open(p_path, 'rb') as f:
+        products = orjson.loads(f.read())
+    with open(s_path, 'rb') as f:
+        stores = orjson.loads(f.read())
     
     return products, stores
 
 
-def generate_deliveries(current_date, store, products):
+def generate_deliveries(date_str, delivery_prefix, store, product_ids, product_names):
     """
     Generate inventory delivery records for a single store on a delivery day.
     
@@ -77,15 +82,21 @@ def generate_deliveries(current_date, store, products):
     This intentionally creates overstock/understock scenarios that mirror
     real-world supply chain challenges.
     
+    Product selection, quantities and delivery IDs are drawn for the whole
+    batch at once with NumPy rather than one product at a time.
+    
     Args:
-        current_date (datetime): Date of the delivery
+        date_str (str): Date of the delivery formatted as YYYY-MM-DD
+        delivery_prefix (str): Delivery ID prefix for the day ("DEL-<timestamp>-")
         store (dict): Store information dictionary containing:
             - store_id: Unique store identifier
             - typology: Store type (Express/Standard/Supercenter)
-        products (list): List of all available products
+        product_ids (numpy.ndarray): IDs of all available products
+        product_names (numpy.ndarray): Names of all available products,
+            aligned with product_ids
     
     Returns:
-        list: List of delivery record dictionaries with fields:
+        dict: Delivery records as NumPy column arrays, keyed by column name:
             - delivery_id: Unique delivery identifier
             - delivery_date: Date of delivery (YYYY-MM-DD)
             - store_id: Store receiving the delivery
@@ -94,8 +105,6 @@ def generate_deliveries(current_date, store, products):
             - quantity_delivered: Number of units delivered
             - delivery_status: Always "Received" (could be extended)
     """
-    deliveries = []
-    
     # Store size determines how MANY different products get restocked
     # Express stores: smaller batches (20-40 different products)
     # Standard/Supercenter: larger batches (50-90 different products)
@@ -103,34 +112,33 @@ def generate_deliveries(current_date, store, products):
         batch_size = random.randint(20, 40)
     else:
         batch_size = random.randint(50, 90)
+    batch_size = min(batch_size, len(product_ids))
     
     # Randomly select which products are being restocked today
     # This creates realistic scenarios where not everything is always in stock
-    selected_products = random.sample(products, min(batch_size, len(products)))
-    
-    for product in selected_products:
-        # Generate unique delivery ID using timestamp and random number
-        delivery_id = f"DEL-{int(current_date.timestamp())}-{random.randint(10000, 99999)}"
-        
-        # QUANTITY LOGIC:
-        # Deliver 10-60 units per product
-        # Since typical sales are 5-30 units/week for popular items,
-        # this creates natural overstock/understock scenarios for analysis
-        qty = random.randint(10, 60)
-        
-        # Build delivery record
-        row = {
-            "delivery_id": delivery_id,
-            "delivery_date": current_date.strftime("%Y-%m-%d"),
-            "store_id": store['store_id'],
-            "product_id": product['product_id'],
-            "product_name": product['product_name'],  # Redundant but realistic for legacy systems
-            "quantity_delivered": qty,
-            "delivery_status": "Received"  # Could be extended to include "Pending", "Partial", etc.
-        }
-        deliveries.append(row)
-    
-    return deliveries
+    idx = rng.choice(len(product_ids), size=batch_size, replace=False)
+    
+    # QUANTITY LOGIC:
+    # Deliver 10-60 units per product
+    # Since typical sales are 5-30 units/week for popular items,
+    # this creates natural overstock/understock scenarios for analysis
+    qtys = rng.integers(10, 61, size=batch_size)
+    
+    # Generate unique delivery IDs using timestamp and random number
+    suffixes = rng.integers(10000, 100000, size=batch_size)
+    delivery_ids = np.char.add(delivery_prefix, suffixes.astype(str))
+    
+    # Build delivery records as column arrays (one DataFrame is built per
+    # store when writing, which is far cheaper than one per batch)
+    return {
+        "delivery_id": delivery_ids,
+        "delivery_date": np.full(batch_size, date_str),
+        "store_id": np.full(batch_size, store['store_id']),
+        "product_id": product_ids[idx],
+        "product_name": product_names[idx],  # Redundant but realistic for legacy systems
+        "quantity_delivered": qtys,
+        "delivery_status": np.full(batch_size, "Received")  # Could be extended to include "Pending", "Partial", etc.
+    }
 
 
 def main():
@@ -141,68 +149,67 @@ def main():
     1. Loads reference data (products and stores)
     2. Creates output directory if needed
     3. Generates delivery records only on scheduled delivery days (Mon/Thu)
-    4. Writes CSV files for each store on each delivery day
+    4. Writes each store's delivery manifests to a single CSV file
     
-    Output: One CSV file per store per delivery day in OUTPUT_DIR
-    Filename format: inventory_STORE_XXX_YYYYMMDD.csv
+    Output: One CSV file per store in OUTPUT_DIR
+    Filename format: inventory_STORE_XXX.csv
     """
     print("🚚 Starting Supply Chain Simulator (Inventory Generator)...")
     
     # Load master data
     products, stores = load_reference_data()
     
+    # Column arrays let generate_deliveries pick products by index
+    product_ids = np.array([p['product_id'] for p in products])
+    product_names = np.array([p['product_name'] for p in products])
+    
     # Create output directory if it doesn't exist
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         print(f"📁 Created output directory: {OUTPUT_DIR}")
     
+    # Collect each store's delivery batches and write them as one CSV per
+    # store at the end, instead of one tiny file per store per delivery day
+    # (thousands of small files are dominated by open/close overhead)
+    store_batches = {store['store_id']: [] for store in stores}
+    
+    # Only generate data on Mondays (0) and Thursdays (3)
+    # dayofweek is 0=Monday, 1=Tuesday, ..., 6=Sunday
+    all_dates = pd.date_range(START_DATE, END_DATE, freq='D')
+    delivery_dates = all_dates[all_dates.dayofweek.isin(DELIVERY_DAYS)]
+    
     # Initialize counters
-    current_date = START_DATE
-    total_files = 0
-    
-    # Generate delivery data day by day
-    while current_date <= END_DATE:
-        # Only generate data on Mondays (0) and Thursdays (3)
-        # weekday() returns 0=Monday, 1=Tuesday, ..., 6=Sunday
-        if current_date.weekday() in DELIVERY_DAYS:
+    total_manifests = 0
+    
+    # Generate delivery data for each delivery day
+    # (as plain datetimes so timestamp() keeps local-time semantics)
+    for current_date in delivery_dates.to_pydatetime():
+        # Progress indicator (print once per month on first Monday)
+        if current_date.day <= 7 and current_date.weekday() == 0:
+            print(f"   Restocking Month: {current_date.strftime('%Y-%m')}...", end='\r')
+        
+        # Format the date and ID prefix once for all stores on this day
+        date_str = current_date.strftime("%Y-%m-%d")
+        delivery_prefix = f"DEL-{int(current_date.timestamp())}-"
+        
+        # Generate deliveries for each store
+        for store in stores:
+            # Generate delivery batch for this store
+            batch = generate_deliveries(date_str, delivery_prefix, store, product_ids, product_names)
             
-            # Progress indicator (print once per month on first Monday)
-            if current_date.day <= 7 and current_date.weekday() == 0:
-                print(f"   Restocking Month: {current_date.strftime('%Y-%m')}...", end='\r')
+            store_batches[store['store_id']].append(batch)
             
-            # Generate deliveries for each store
-            for store in stores:
-                # Generate delivery batch for this store
-                batch = generate_deliveries(current_date, store, products)
-                
-                # Create filename: inventory_STORE_001_20230102.csv
-                filename = f"inventory_{store['store_id']}_{current_date.strftime('%Y%m%d')}.csv"
-                filepath = os.path.join(OUTPUT_DIR, filename)
-                
-                # Define CSV column headers
-                keys = [
-                    "delivery_id",
-                    "delivery_date",
-                    "store_id",
-                    "product_id",
-                    "product_name",
-                    "quantity_delivered",
-                    "delivery_status"
-                ]
-                
-                # Write CSV file
-                with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=keys)
-                    writer.writeheader()
-                    writer.writerows(batch)
-                
-                total_files += 1
-        
-        # Move to next day
-        current_date += timedelta(days=1)
+            total_manifests += 1
+    
+    # Write one CSV file per store
+    # Filename format: inventory_STORE_001.csv
+    for store_id, batches in store_batches.items():
+        filepath = os.path.join(OUTPUT_DIR, f"inventory_{store_id}.csv")
+        columns = {key: np.concatenate([batch[key] for batch in batches]) for key in batches[0]}
+        pd.DataFrame(columns).to_csv(filepath, index=False)
     
     # Final summary
-    print(f"\n✅ Supply Chain Complete! Generated {total_files} Delivery Manifests.")
+    print(f"\n✅ Supply Chain Complete! Generated {total_manifests} Delivery Manifests in {len(store_batches)} files.")
     print(f"📊 Date Range: {START_DATE.strftime('%Y-%m-%d')} to {END_DATE.strftime('%Y-%m-%d')}")
     print(f"📅 Delivery Schedule: {', '.join(['Monday' if d == 0 else 'Thursday' for d in DELIVERY_DAYS])}")
     print(f"🏪 Stores: {len(stores)}")
@@ -15,10 +15,14 @@ Author: GreenGrocer Project
 Date: 2025
 """
 
-import json
+import orjson
 import csv
 import random
 import os
+import re
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 # --- CONFIGURATION ---
@@ -58,6 +62,22 @@ TYPO_MAPPINGS = {
     "Organic": ["Org.", "Bio", "Organic -"],
 }
 
+# Every spelling we replace (capitalized and lowercase), mapped back to its
+# TYPO_MAPPINGS key, so all words can be swapped in a single regex pass
+TYPO_LOOKUP = {
+    **{word: word for word in TYPO_MAPPINGS},
+    **{word.lower(): word for word in TYPO_MAPPINGS},
+}
+
+# Longest alternatives first so a shorter word never shadows a longer one
+TYPO_PATTERN = re.compile(
+    "|".join(re.escape(w) for w in sorted(TYPO_LOOKUP, key=len, reverse=True))
+)
+
+# NumPy random generator used for vectorized sampling (product selection,
+# quantities) - much faster than drawing one value at a time with `random`
+rng = np.random.default_rng()
+
 
 def load_reference_data():
     """
@@ -70,15 +90,15 @@ def load_reference_data():
     
     Raises:
         FileNotFoundError: If reference data files are missing
-        json.JSONDecodeError: If JSON files are malformed
+        orjson.JSONDecodeError: If JSON files are malformed
     """
     p_path = os.path.join(REFERENCE_DIR, "products_master.json")
     s_path = os.path.join(REFERENCE_DIR, "stores_master.json")
     
-    with open(p_path, 'r', encoding='utf-8') as f:
-        products = json.load(f)
-    with open(s_path, 'r', encoding='utf-8') as f:
-        stores = json.load(f)
+    with open(p_path, 'rb') as f:
+        products = orjson.loads(f.read())
+    with open(s_path, 'rb') as f:
+        stores = orjson.loads(f.read())
     
     return products, stores
 
@@ -137,17 +157,17 @@ def messy_product_name(clean_name):
     if random.random() > TYPO_PROBABILITY:
         return clean_name
     
-    dirty_name = clean_name
+    # Replace every known word (capitalized or lowercase) with a variation,
+    # picking one variation per word and reusing it for every occurrence
+    chosen = {}
     
-    # Look for known words and replace with variations
-    for word, variations in TYPO_MAPPINGS.items():
-        if word.lower() in clean_name.lower():
-            replacement = random.choice(variations)
-            # Replace both capitalized and lowercase versions
-            dirty_name = dirty_name.replace(word, replacement)
-            dirty_name = dirty_name.replace(word.lower(), replacement)
+    def replace(match):
+        word = TYPO_LOOKUP[match.group(0)]
+        if word not in chosen:
+            chosen[word] = random.choice(TYPO_MAPPINGS[word])
+        return chosen[word]
     
-    return dirty_name
+    return TYPO_PATTERN.sub(replace, clean_name)
 
 
 def get_seasonal_weight(product, month):
@@ -182,7 +202,48 @@ def get_seasonal_weight(product, month):
     return weight
 
 
-def generate_daily_sales(current_date, store, products, break_date):
+def build_month_weights(products):
+    """
+    Precompute seasonal weights for every product in every month.
+    
+    Seasonal weights only depend on the month and fixed product attributes,
+    so they are calculated once up front instead of once per store per day.
+    
+    Args:
+        products (list): List of available products
+    
+    Returns:
+        numpy.ndarray: Array of shape (13, len(products)) where row m holds
+            the weights for month m (row 0 is unused so months index directly)
+    """
+    month_weights = np.ones((13, len(products)), dtype=np.float64)
+    for month in range(1, 13):
+        for i, product in enumerate(products):
+            month_weights[month, i] = get_seasonal_weight(product, month)
+    
+    return month_weights
+
+
+def get_date_column_name(current_date, break_date):
+    """
+    Determine the name of the date column for a store on a given day.
+    
+    Schema Drift: stores that received the buggy update write their date
+    column as "date_of_sale" instead of "sale_date" from break_date onwards.
+    
+    Args:
+        current_date (datetime): Date of the sales file
+        break_date (datetime or None): Date when schema drift occurs
+    
+    Returns:
+        str: "sale_date" (original column name) or "date_of_sale" (after drift)
+    """
+    if break_date and current_date >= break_date:
+        return "date_of_sale"  # Buggy update changes column name
+    return "sale_date"
+
+
+def generate_daily_sales(current_date, date_str, txn_prefix, store, product_rows, prices, month_weights):
     """
     Generate sales transactions for a single store on a single day.
     
@@ -191,20 +252,26 @@ def generate_daily_sales(current_date, store, products, break_date):
     - Seasonal product preferences
     - Random product name typos
     - Occasional duplicate transactions
-    - Schema drift after break_date (if applicable)
+    
+    Rows are built as tuples in CSV column order so they can be handed
+    straight to csv.writer without an intermediate dictionary.
     
     Args:
         current_date (datetime): Date for which to generate sales
+        date_str (str): current_date formatted as YYYY-MM-DD
+        txn_prefix (str): Transaction ID prefix for the day ("TXN-<timestamp>-")
         store (dict): Store information dictionary
-        products (list): List of available products
-        break_date (datetime or None): Date when schema drift occurs
+        product_rows (list): (product_id, product_name) tuple for each product
+        prices (numpy.ndarray): Selling price of each product, aligned with product_rows
+        month_weights (numpy.ndarray): Seasonal weights per month and product
+            (see build_month_weights)
     
     Returns:
-        list: List of transaction dictionaries with fields:
+        list: List of transaction tuples with fields (in order):
             - transaction_id: Unique transaction identifier
             - store_id: Store identifier
-            - date_header: Column name for date ("sale_date" or "date_of_sale")
-            - date_value: Transaction date
+            - date: Transaction date (column name depends on schema drift,
+              see get_date_column_name)
             - product_id: Product identifier
             - product_name: Product name (possibly with typos)
             - quantity: Number of items purchased
@@ -212,6 +279,7 @@ def generate_daily_sales(current_date, store, products, break_date):
             - total_amount: Total transaction amount
     """
     daily_transactions = []
+    store_id = store['store_id']
     
     # 1. Volume Logic (Weekly Cycle)
     # Weekends (Friday=4, Saturday=5, Sunday=6) get 50% more traffic
@@ -223,51 +291,168 @@ def generate_daily_sales(current_date, store, products, break_date):
     num_txns = random.randint(base_volume - 20, base_volume + 40)
     
     # 2. Seasonality Logic
-    # Calculate weights once per day for all products (performance optimization)
-    current_month = current_date.month
-    weights = [get_seasonal_weight(p, current_month) for p in products]
+    # Weights are precomputed per month for all products (performance optimization)
+    weights = month_weights[current_date.month]
     
     # 3. Select products based on seasonal weights
     # Products with higher weights are more likely to be selected
-    selected_products = random.choices(products, weights=weights, k=num_txns)
+    probs = weights / weights.sum()
+    selected_idx = rng.choice(len(product_rows), size=num_txns, p=probs)
+    
+    # Random quantity between 1 and 5 items, drawn for the whole day at once
+    quantities = rng.integers(1, 6, size=num_txns)
+    
+    # Price every transaction of the day in one vectorized pass
+    unit_prices = prices[selected_idx]
+    totals = np.round(unit_prices * quantities, 2)
+    
+    # Random 4-digit transaction ID suffixes for the whole day
+    id_suffixes = rng.integers(1000, 10000, size=num_txns)
     
     # 4. Generate transactions
-    for product in selected_products:
+    for i, quantity, unit_price, total, id_suffix in zip(
+        selected_idx.tolist(), quantities.tolist(), unit_prices.tolist(), totals.tolist(),
+        id_suffixes.tolist()
+    ):
+        product_id, product_name = product_rows[i]
+        
         # Create unique transaction ID using timestamp and random number
-        txn_id = f"TXN-{int(current_date.timestamp())}-{random.randint(1000, 9999)}"
+        txn_id = f"{txn_prefix}{id_suffix}"
         
         # Apply potential typos to product name
-        final_product_name = messy_product_name(product['product_name'])
-        
-        # Random quantity between 1 and 5 items
-        quantity = random.randint(1, 5)
-        
-        # Build transaction record
-        row = {
-            "transaction_id": txn_id,
-            "store_id": store['store_id'],
-            "date_header": "sale_date",  # Original column name
-            "date_value": current_date.strftime("%Y-%m-%d"),
-            "product_id": product['product_id'],
-            "product_name": final_product_name,
-            "quantity": quantity,
-            "unit_price": product['price_sell'],
-            "total_amount": round(product['price_sell'] * quantity, 2)
-        }
-        
-        # Schema Drift: Change date column name after break_date
-        if break_date and current_date >= break_date:
-            row['date_header'] = "date_of_sale"  # Buggy update changes column name
+        final_product_name = messy_product_name(product_name)
         
+        # Build transaction record (CSV column order)
+        row = (
+            txn_id,
+            store_id,
+            date_str,
+            product_id,
+            final_product_name,
+            quantity,
+            unit_price,
+            total
+        )
         daily_transactions.append(row)
-        
-        # Duplicate Injection: Randomly create duplicate transactions
-        if random.random() < DUPLICATE_PROBABILITY:
-            daily_transactions.append(row.copy())  # Exact duplicate
+    
+    # Duplicate Injection: Randomly create duplicate transactions
+    # Decide for the whole day at once and append the exact duplicates
+    # (tuples are immutable, so the same row object can be reused)
+    dup_idx = np.flatnonzero(rng.random(len(daily_transactions)) < DUPLICATE_PROBABILITY)
+    daily_transactions.extend([daily_transactions[i] for i in dup_idx.tolist()])
     
     return daily_transactions
 
 
+# Read-only reference data shared with worker processes (set by init_worker)
+_worker_data = {}
+
+
+def init_worker(dates, product_rows, prices, month_weights):
+    """
+    Initialize a worker process for parallel sales generation.
+    
+    Runs once per worker so the reference data is pickled once per process
+    rather than once per task. Also reseeds the random generators: forked
+    workers would otherwise inherit identical RNG states and produce the
+    same "random" sales for every store.
+    
+    Args:
+        dates (numpy.ndarray): Every date in the generation period, as datetimes
+        product_rows (list): (product_id, product_name) tuple for each product
+        prices (numpy.ndarray): Selling price of each product
+        month_weights (numpy.ndarray): Seasonal weights per month and product
+    """
+    global rng
+    rng = np.random.default_rng()
+    random.seed()
+    
+    _worker_data['dates'] = dates
+    _worker_data['product_rows'] = product_rows
+    _worker_data['prices'] = prices
+    _worker_data['month_weights'] = month_weights
+
+
+def generate_store_sales(store, break_date):
+    """
+    Generate and write the full sales history of a single store.
+    
+    Stores are independent of each other, so each one is handled by its own
+    worker process. The store's rows are streamed into one open CSV; a new
+    file is only started when the store's schema drifts, so every file still
+    has a single, consistent header. Files left by earlier runs for this
+    store are removed first: a drifted store's second file is named after a
+    random break date, so a re-run would otherwise leave overlapping data
+    behind.
+    
+    Args:
+        store (dict): Store information dictionary
+        break_date (datetime or None): Date when schema drift occurs
+    
+    Returns:
+        int: Number of CSV files written for this store
+    """
+    product_rows = _worker_data['product_rows']
+    prices = _worker_data['prices']
+    month_weights = _worker_data['month_weights']
+    dates = _worker_data['dates']
+    
+    # Remove this store's files from earlier runs (sales_STORE_001_YYYYMMDD.csv)
+    old_file_pattern = re.compile(rf"sales_{re.escape(store['store_id'])}_\d{{8}}\.csv")
+    for filename in os.listdir(OUTPUT_DIR):
+        if old_file_pattern.fullmatch(filename):
+            os.remove(os.path.join(OUTPUT_DIR, filename))
+    
+    current_header = None
+    csvfile = None
+    writer = None
+    total_files = 0
+    
+    # Generate sales data day by day
+    for current_date in dates:
+        # Date strings only change once per day, so format them here rather
+        # than once per transaction
+        date_str = current_date.strftime("%Y-%m-%d")
+        date_stamp = current_date.strftime("%Y%m%d")
+        txn_prefix = f"TXN-{int(current_date.timestamp())}-"
+        
+        # Generate transactions
+        sales = generate_daily_sales(current_date, date_str, txn_prefix, store, product_rows, prices, month_weights)
+        
+        # Skip if no sales generated
+        if sales:
+            # Note: date column name varies based on schema drift
+            date_col_name = get_date_column_name(current_date, break_date)
+            
+            # Start a new file on the first day and whenever the header
+            # changes (schema drift)
+            if date_col_name != current_header:
+                if csvfile is not None:
+                    csvfile.close()
+                
+                # Create filename from the first day it covers: sales_STORE_001_20230101.csv
+                filename = f"sales_{store['store_id']}_{date_stamp}.csv"
+                filepath = os.path.join(OUTPUT_DIR, filename)
+                
+                # Determine CSV column headers
+                keys = ["transaction_id", "store_id", date_col_name, "product_id",
+                       "product_name", "quantity", "unit_price", "total_amount"]
+                
+                csvfile = open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+                writer = csv.writer(csvfile)
+                writer.writerow(keys)
+                current_header = date_col_name
+                total_files += 1
+            
+            # Stream the day's rows into the store's file
+            writer.writerows(sales)
+    
+    if csvfile is not None:
+        csvfile.close()
+    
+    return total_files
+
+
 def main():
     """
     Main execution function for the chaos generator.
@@ -275,10 +460,12 @@ def main():
     Orchestrates the entire sales data generation process:
     1. Loads reference data (products and stores)
     2. Assigns chaos profiles (schema drift dates) to stores
-    3. Generates daily sales for each store across the date range
+    3. Generates daily sales for each store across the date range, one
+       store per worker process
     4. Writes CSV files with intentional data quality issues
     
-    Output: One CSV file per store per day in OUTPUT_DIR
+    Output: One CSV file per store in OUTPUT_DIR, plus a new file from the
+    day a store's schema drifts (named after the first day it covers)
     Filename format: sales_STORE_XXX_YYYYMMDD.csv
     """
     print("🚀 Starting Chaos Engine (Seasonal + Rolling Updates)...")
@@ -291,59 +478,36 @@ def main():
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         print(f"📁 Created output directory: {OUTPUT_DIR}")
     
+    # Precompute seasonal weights for every month once
+    month_weights = build_month_weights(products)
+    
+    # Product prices as an array so daily totals can be computed in one pass
+    prices = np.array([p['price_sell'] for p in products], dtype=np.float64)
+    
+    # The hot loop only needs IDs and names - unpack them once into tuples
+    # instead of indexing product dictionaries for every transaction
+    product_rows = [(p['product_id'], p['product_name']) for p in products]
+    
+    # Every day in the generation period, built once instead of stepping a
+    # datetime day by day (plain datetimes so timestamp() keeps local-time
+    # semantics)
+    dates = pd.date_range(START_DATE, END_DATE, freq='D').to_pydatetime()
+    
     # Assign which stores will experience schema drift and when
     chaos_map = assign_chaos_profiles(stores)
     
-    # Initialize counters
-    current_date = START_DATE
+    # Generate each store's history in parallel - stores share no state
+    # beyond the read-only reference data handed to every worker once
     total_files = 0
-    
-    # Generate sales data day by day
-    while current_date <= END_DATE:
-        # Progress indicator (print once per month)
-        if current_date.day == 1:
-            print(f"   Processing Month: {current_date.strftime('%Y-%m')}...", end='\r')
-        
-        # Generate sales for each store on this day
-        for store in stores:
-            # Get the schema drift date for this store (if any)
-            store_break_date = chaos_map.get(store['store_id'])
-            
-            # Generate transactions
-            sales = generate_daily_sales(current_date, store, products, store_break_date)
-            
-            # Skip if no sales generated
-            if not sales:
-                continue
-            
-            # Create filename: sales_STORE_001_20230101.csv
-            filename = f"sales_{store['store_id']}_{current_date.strftime('%Y%m%d')}.csv"
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            
-            # Determine CSV column headers
-            # Note: date column name varies based on schema drift
-            keys = ["transaction_id", "store_id", "product_id", "product_name", 
-                   "quantity", "unit_price", "total_amount"]
-            date_col_name = sales[0]['date_header']  # "sale_date" or "date_of_sale"
-            keys.insert(2, date_col_name)  # Insert date column in 3rd position
-            
-            # Write CSV file
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=keys)
-                writer.writeheader()
-                
-                for row in sales:
-                    # Convert internal row format to CSV format
-                    csv_row = row.copy()
-                    del csv_row['date_header']  # Remove metadata fields
-                    del csv_row['date_value']
-                    csv_row[date_col_name] = row['date_value']  # Map to correct column name
-                    writer.writerow(csv_row)
-            
-            total_files += 1
-        
-        # Move to next day
-        current_date += timedelta(days=1)
+    with ProcessPoolExecutor(
+        initializer=init_worker,
+        initargs=(dates, product_rows, prices, month_weights)
+    ) as executor:
+        break_dates = [chaos_map.get(store['store_id']) for store in stores]
+        for done, num_files in enumerate(executor.map(generate_store_sales, stores, break_dates), start=1):
+            total_files += num_files
+            # Progress indicator
+            print(f"   Processed {done}/{len(stores)} stores...", end='\r')
     
     # Final summary
     print(f"\n✅ Done! Generated {total_files} CSV files.")
@@ -0,0 +1,53 @@
+-- Landing zone (Bronze Layer) tables for the ingestion pipeline.
+-- Run once when the database is bootstrapped: docker-compose mounts this
+-- folder into /docker-entrypoint-initdb.d, so Postgres applies it the first
+-- time the data volume is initialized.
+--
+-- Every data column is TEXT on purpose; types are fixed downstream in dbt.
+-- Column names are the standardized names produced by scripts/ingest_data.py
+-- after schema-drift renaming. source_path records the file each row came
+-- from, so an incremental run can replace the rows of a file that changed.
+
+CREATE TABLE IF NOT EXISTS public.raw_sales (
+    transaction_id        TEXT,
+    store_id              TEXT,
+    sale_date             TEXT,
+    date_of_sale          TEXT,  -- Drifted name of sale_date in some source files
+    transaction_timestamp TEXT,
+    product_id            TEXT,
+    product_name          TEXT,
+    quantity              TEXT,
+    unit_price            TEXT,
+    total_amount          TEXT,
+    source_path           TEXT
+);
+
+CREATE INDEX IF NOT EXISTS raw_sales_source_path_idx ON public.raw_sales (source_path);
+
+CREATE TABLE IF NOT EXISTS public.raw_inventory (
+    delivery_id        TEXT,
+    delivery_date      TEXT,
+    store_id           TEXT,
+    product_id         TEXT,
+    product_name       TEXT,
+    quantity_delivered TEXT,
+    delivery_status    TEXT,
+    source_path        TEXT
+);
+
+CREATE INDEX IF NOT EXISTS raw_inventory_source_path_idx ON public.raw_inventory (source_path);
+
+-- Manifests: one row per source file already loaded, used for incremental ingest
+CREATE TABLE IF NOT EXISTS public.raw_sales_manifest (
+    path      TEXT PRIMARY KEY,
+    size      BIGINT,
+    mtime     DOUBLE PRECISION,
+    loaded_at TIMESTAMP DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS public.raw_inventory_manifest (
+    path      TEXT PRIMARY KEY,
+    size      BIGINT,
+    mtime     DOUBLE PRECISION,
+    loaded_at TIMESTAMP DEFAULT now()
+);